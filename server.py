@@ -7,6 +7,8 @@
 import os
 import json
 import re
+import hashlib
+import gzip
 import smtplib
 import tempfile
 from datetime import datetime
@@ -14,7 +16,8 @@ from email.message import EmailMessage
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, abort
+from werkzeug.security import safe_join
 from flask_cors import CORS
 from dotenv import load_dotenv
 import pandas as pd
@@ -41,12 +44,19 @@ try:
 except ImportError:
     DOCX_AVAILABLE = False
 
+# Brotli response compression (falls back to gzip)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 # HTTP for OpenRouter API
 import requests as http_requests
 
 load_dotenv()
 
-app = Flask(__name__, static_folder='ui', static_url_path='')
+app = Flask(__name__, static_folder=None)  # UI served by serve_ui_file()
 CORS(app)
 
 # ── Config ──
@@ -60,13 +70,139 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 # STATIC FILE SERVING (UI)
 # =========================
 
+STATIC_DIR = os.path.join(app.root_path, "ui")
+STATIC_MAX_AGE = 365 * 24 * 3600     # versioned (?v=) assets never change
+STATIC_UNVERSIONED_MAX_AGE = 3600    # anything else is revalidated via ETag hourly
+
+# Local script/stylesheet references in our HTML pages, e.g. src="jobs.js"
+ASSET_REF_RE = re.compile(r'((?:src|href)=")([\w./-]+\.(?:js|css))(")')
+
+_asset_versions = {}
+
+
+def asset_version(filename):
+    """Short content hash of a UI asset, used as its cache-busting ?v= value."""
+    path = safe_join(STATIC_DIR, filename)
+    if not path or not os.path.isfile(path):
+        return None
+    mtime = os.path.getmtime(path)
+    cached = _asset_versions.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        version = hashlib.sha256(f.read()).hexdigest()[:12]
+    _asset_versions[path] = (mtime, version)
+    return version
+
+
+def serve_ui_file(path):
+    """Serve a UI file with ETags and cache headers.
+
+    HTML pages are always revalidated and have their asset URLs stamped with
+    a content hash, so the assets themselves can be cached for a year.
+    """
+    if path.endswith('.html'):
+        full_path = safe_join(STATIC_DIR, path)
+        if not full_path or not os.path.isfile(full_path):
+            abort(404)
+        with open(full_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        def stamp(m):
+            version = asset_version(m.group(2))
+            return f"{m.group(1)}{m.group(2)}?v={version}{m.group(3)}" if version else m.group(0)
+
+        response = app.response_class(ASSET_REF_RE.sub(stamp, html), mimetype='text/html')
+        response.cache_control.no_cache = True
+        response.add_etag()
+        return response.make_conditional(request)
+
+    # Only pin the exact content the version hash was computed from
+    if request.args.get('v') and request.args['v'] == asset_version(path):
+        response = send_from_directory(STATIC_DIR, path, max_age=STATIC_MAX_AGE)
+        response.cache_control.immutable = True
+    else:
+        response = send_from_directory(STATIC_DIR, path, max_age=STATIC_UNVERSIONED_MAX_AGE)
+    response.cache_control.public = True
+    return response
+
 @app.route('/')
 def serve_login():
-    return send_from_directory('ui', 'login.html')
+    return serve_ui_file('login.html')
 
 @app.route('/<path:path>')
 def serve_static(path):
-    return send_from_directory('ui', path)
+    return serve_ui_file(path)
+
+
+# =========================
+# RESPONSE SHAPING
+# =========================
+
+COMPRESS_MIN_SIZE = 1024  # bytes; smaller bodies aren't worth the CPU
+COMPRESS_MIMETYPES = {
+    "application/json", "application/javascript", "text/javascript",
+    "text/html", "text/css", "text/plain", "image/svg+xml",
+}
+
+
+@app.after_request
+def compress_response(response):
+    """Brotli/gzip-encode large text responses the client can accept."""
+    if ("Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES):
+        return response
+
+    # Every status for these types (200, 206, 304, ...) must carry the same
+    # Vary and validators. Ranges aren't advertised, since they would refer
+    # to the unencoded file.
+    response.vary.add("Accept-Encoding")
+    response.headers.pop("Accept-Ranges", None)
+    accepted = request.accept_encodings
+    if BROTLI_AVAILABLE and accepted["br"]:
+        encoding = "br"
+    elif accepted["gzip"]:
+        encoding = "gzip"
+    else:
+        return response
+
+    # Encoded bytes differ from the file, so only a weak validator still holds
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+    if response.status_code != 200:
+        return response
+
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    if encoding == "br":
+        response.set_data(brotli.compress(data, quality=5))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def project_fields(payload, items_key=None):
+    """Trim a response payload to the comma-separated ?fields= the client asked for.
+
+    With items_key, the projection applies to each item of that list instead of
+    the top level (e.g. ?fields=job_id,job_title on /api/analyze).
+    """
+    fields = {f.strip() for f in request.args.get("fields", "").split(",") if f.strip()}
+    if not fields:
+        return payload
+    if items_key:
+        payload[items_key] = [
+            {k: v for k, v in item.items() if k in fields}
+            for item in payload.get(items_key, [])
+        ]
+        return payload
+    return {k: v for k, v in payload.items() if k in fields or k in ("success", "error")}
 
 
 # =========================
@@ -95,10 +231,129 @@ def extract_text_from_pdf(file_path):
     except:
         return ""
 
+def load_latest_resume_text():
+    """Fallback: read the most recently uploaded resume from disk"""
+    import glob
+    resume_files = glob.glob(os.path.join(UPLOAD_DIR, "resume_*.*"))
+    if not resume_files:
+        return ""
+    latest = max(resume_files, key=os.path.getmtime)
+    ext = latest.lower().rsplit('.', 1)[-1]
+    if ext == 'pdf':
+        return extract_text_from_pdf(latest)
+    elif ext == 'txt':
+        with open(latest, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+    elif ext in ['docx', 'doc'] and DOCX_AVAILABLE:
+        try:
+            doc = Document(latest)
+            return '\n'.join([p.text for p in doc.paragraphs])
+        except:
+            return ""
+    return ""
+
 def extract_name_from_text(text):
     return ""
 
 
+# =========================
+# AI HELPERS (Gemini)
+# =========================
+
+def call_ai(prompt_text, gemini_api_key, retries=4):
+    """Call Gemini API natively using google.generativeai."""
+    import time
+    import google.generativeai as genai
+    for attempt in range(retries + 1):
+        try:
+            genai.configure(api_key=gemini_api_key)
+            model = genai.GenerativeModel("gemini-2.5-flash")
+
+            response = model.generate_content(
+                prompt_text,
+                generation_config=genai.GenerationConfig(temperature=0),
+            )
+
+            return response.text
+        except Exception as e:
+            err_str = str(e).lower()
+            if "429" in err_str or "quota" in err_str or "rate limit" in err_str:
+                if attempt < retries:
+                    wait = 15 * (attempt + 1)
+                    print(f"[Wait] Rate limited. Waiting {wait}s before retry {attempt + 1}/{retries}...")
+                    time.sleep(wait)
+                    continue
+                raise Exception("Google Gemini Free Tier Rate Limit hit. Please wait a minute and try again.")
+
+            print(f"[Wait] API error: {e}. Retry {attempt + 1}/{retries}...")
+            if attempt < retries:
+                time.sleep(5 * (attempt + 1))
+                continue
+            raise e
+
+def extract_json(text):
+    """Robustly extract and repair JSON from AI response text."""
+    import re as _re
+    text = text.strip()
+    # Strip markdown code fences
+    if text.startswith("```"):
+        lines = text.split("\n")
+        text = "\n".join(lines[1:])
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3].rstrip()
+    # Find the JSON object
+    start = text.find("{")
+    end = text.rfind("}") + 1
+    if start != -1 and end > start:
+        text = text[start:end]
+    # Fix trailing commas before } or ]
+    text = _re.sub(r',\s*([}\]])', r'\1', text)
+    # Try parsing directly first
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    # Try fixing truncated JSON by closing unclosed brackets
+    open_braces = text.count('{') - text.count('}')
+    open_brackets = text.count('[') - text.count(']')
+    # Remove any trailing incomplete entry (after last complete object)
+    last_complete = text.rfind('},')
+    if last_complete == -1:
+        last_complete = text.rfind('}')
+    if last_complete > 0:
+        text = text[:last_complete + 1]
+    text += ']' * max(0, open_brackets) + '}' * max(0, open_braces)
+    text = _re.sub(r',\s*([}\]])', r'\1', text)
+    return json.loads(text)
+
+
+
+# Fields of an extracted job that feed into an email draft
+DRAFT_JOB_FIELDS = ("job_title", "company", "apply_email", "job_type", "location", "skills", "jd_summary")
+
+# Drafts keyed by (job, template, resume) hash – best effort, per process
+DRAFT_CACHE_MAX = 512
+_draft_cache = {}
+
+
+def draft_cache_key(job, sample_email, resume_text, user_name):
+    """Hash the inputs that determine a job's email draft."""
+    payload = json.dumps({
+        "job": {k: job.get(k) for k in DRAFT_JOB_FIELDS},
+        "template": sample_email,
+        "resume": hashlib.sha256(resume_text.encode("utf-8")).hexdigest(),
+        "user_name": user_name,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_draft(key, draft):
+    """Store a draft, evicting the oldest entry once the cache is full."""
+    if len(_draft_cache) >= DRAFT_CACHE_MAX:
+        _draft_cache.pop(next(iter(_draft_cache)))
+    _draft_cache[key] = draft
+
+
 # =========================
 # API ROUTES
 # =========================
@@ -181,7 +436,7 @@ def upload_resume():
 
     resume_name = extract_name_from_text(resume_text)
 
-    return jsonify({
+    return jsonify(project_fields({
         "success": True,
         "filename": file.filename,
         "size": os.path.getsize(save_path),
@@ -189,7 +444,7 @@ def upload_resume():
         "resume_text": resume_text,
         "resume_name": resume_name,
         "resume_path": save_path
-    })
+    }))
 
 
 from werkzeug.utils import secure_filename
@@ -218,12 +473,12 @@ def upload_txt():
     with open(save_path, 'w', encoding='utf-8') as f:
         f.write(content)
 
-    return jsonify({
+    return jsonify(project_fields({
         "success": True,
         "filename": safe_name,
         "char_count": len(content),
         "preview": content[:1000]
-    })
+    }))
 
 
 # ── Set sample email template ──
@@ -243,9 +498,7 @@ def analyze_jobs():
         return jsonify({"success": False, "error": "No Gemini API key provided. Please enter your API key in Settings."}), 400
 
     txt_content = data.get("txt_content", "")
-    sample_email = data.get("sample_email", "Professional email")
     resume_text = data.get("resume_text", "")
-    user_name = data.get("user_name", "")
 
     # Fallback to load from disk if session is empty (e.g. server reset)
     import glob
@@ -258,32 +511,13 @@ def analyze_jobs():
                 txt_content = f.read()
 
     if not resume_text:
-        uploads_dir = UPLOAD_DIR
-        resume_files = glob.glob(os.path.join(uploads_dir, "resume_*.*"))
-        if resume_files:
-            latest = max(resume_files, key=os.path.getmtime)
-            ext = latest.lower().rsplit('.', 1)[-1]
-            if ext == 'pdf':
-                resume_text = extract_text_from_pdf(latest)
-            elif ext == 'txt':
-                with open(latest, 'r', encoding='utf-8', errors='ignore') as f:
-                    resume_text = f.read()
-            elif ext in ['docx', 'doc'] and DOCX_AVAILABLE:
-                try:
-                    from docx import Document
-                    doc = Document(latest)
-                    resume_text = '\n'.join([p.text for p in doc.paragraphs])
-                except:
-                    pass
+        resume_text = load_latest_resume_text()
 
     if not txt_content:
         return jsonify({"success": False, "error": "No job text to analyze. Upload a .txt file first."}), 400
 
-    user_sample_email_safe = sample_email if sample_email.strip() else "Professional email"
-    user_name_display = user_name if user_name else "[Your Name]"
-
     PROMPT = f"""
-You are a highly skilled AI assistant specialized in analyzing job postings and drafting professional job application emails.
+You are a highly skilled AI assistant specialized in analyzing job postings.
 
 Your input text may contain multiple, unstructured job postings scraped from LinkedIn or other sources.
 
@@ -295,8 +529,7 @@ Your tasks:
    - Is located OUTSIDE India
 3. For each remaining job:
    - Extract ONLY factual information explicitly present in the text
-   - Generate a professional, polite, concise email draft by FOLLOWING the STYLE and STRUCTURE of the template below
-   - Ensure emails are human-like, coherent, and well-formatted
+   - Keep every field short; do NOT write emails or long descriptions
 
 Strict JSON output schema:
 
@@ -309,33 +542,11 @@ Strict JSON output schema:
       "job_type": "Internship" | "Full-time" | "Contract" | "Part-time" | "Unknown",
       "location": string,
       "skills": string or null,
-      "jd_summary": string,         # 1-2 sentences summarizing role, tech stack, and expectations
-      "description": string,        # Important job details formatted as: 
-                                    # 📌 About Company: (brief company info if available)
-                                    # 💼 Key Responsibilities: (main tasks/duties)
-                                    # ✅ Requirements: (qualifications, experience needed)
-                                    # 💰 Compensation: (salary/stipend if mentioned)
-                                    # ⚠️ Important Points: (deadline, work hours, special notes, red flags if any)
-      "email_subject": string,      # Clear, professional subject, e.g., "Application for <Job Title> role"
-      "email_body_draft": string    # Polished email, max 2 short paragraphs + closing
+      "jd_summary": string          # 1-2 sentences summarizing role, tech stack, and expectations
     }}
   ]
 }}
 
-Rules for `email_body_draft`:
-- Style reference template (DO NOT COPY TEXT):
-
-\"\"\"
-{user_sample_email_safe}
-\"\"\"
-- Preserve tone and structure
-- Lightly customize for each job using job title, skills, and JD summary
-- Keep paragraphs short and readable
-- Do NOT exaggerate, invent skills, or fabricate experience
-- Ensure proper grammar and professional formatting
-- IMPORTANT: Use explicit `\\n\\n` characters to separate paragraphs.
-- IMPORTANT: End email with "Yours sincerely," followed by the applicant's name: "{user_name_display}"
-
 Additional instructions:
 - Output JSON ONLY
 - Do NOT include explanations, comments, or non-job content
@@ -346,74 +557,8 @@ Additional instructions:
 TEXT TO ANALYZE:
 """
 
-    def call_ai(prompt_text, retries=4):
-        """Call Gemini API natively using google.generativeai."""
-        import time
-        import google.generativeai as genai
-        for attempt in range(retries + 1):
-            try:
-                genai.configure(api_key=gemini_api_key)
-                model = genai.GenerativeModel("gemini-2.5-flash")
-                
-                response = model.generate_content(
-                    prompt_text,
-                    generation_config=genai.GenerationConfig(temperature=0),
-                )
-                
-                return response.text
-            except Exception as e:
-                err_str = str(e).lower()
-                if "429" in err_str or "quota" in err_str or "rate limit" in err_str:
-                    if attempt < retries:
-                        wait = 15 * (attempt + 1)
-                        print(f"[Wait] Rate limited. Waiting {wait}s before retry {attempt + 1}/{retries}...")
-                        time.sleep(wait)
-                        continue
-                    raise Exception("Google Gemini Free Tier Rate Limit hit. Please wait a minute and try again.")
-                
-                print(f"[Wait] API error: {e}. Retry {attempt + 1}/{retries}...")
-                if attempt < retries:
-                    time.sleep(5 * (attempt + 1))
-                    continue
-                raise e
-
-    def extract_json(text):
-        """Robustly extract and repair JSON from AI response text."""
-        import re as _re
-        text = text.strip()
-        # Strip markdown code fences
-        if text.startswith("```"):
-            lines = text.split("\n")
-            text = "\n".join(lines[1:])
-            if text.rstrip().endswith("```"):
-                text = text.rstrip()[:-3].rstrip()
-        # Find the JSON object
-        start = text.find("{")
-        end = text.rfind("}") + 1
-        if start != -1 and end > start:
-            text = text[start:end]
-        # Fix trailing commas before } or ]
-        text = _re.sub(r',\s*([}\]])', r'\1', text)
-        # Try parsing directly first
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
-        # Try fixing truncated JSON by closing unclosed brackets
-        open_braces = text.count('{') - text.count('}')
-        open_brackets = text.count('[') - text.count(']')
-        # Remove any trailing incomplete entry (after last complete object)
-        last_complete = text.rfind('},')
-        if last_complete == -1:
-            last_complete = text.rfind('}')
-        if last_complete > 0:
-            text = text[:last_complete + 1]
-        text += ']' * max(0, open_brackets) + '}' * max(0, open_braces)
-        text = _re.sub(r',\s*([}\]])', r'\1', text)
-        return json.loads(text)
-
     try:
-        response_text = call_ai(PROMPT + "\n\n" + txt_content)
+        response_text = call_ai(PROMPT + "\n\n" + txt_content, gemini_api_key)
         if not response_text:
             return jsonify({"success": False, "error": "AI model returned an empty response. It may be overloaded. Please try again."}), 500
         
@@ -453,7 +598,7 @@ JOBS:
 Output JSON only: {{"scores": [{{"job_id": 1, "score": 85}}, ...]}}
 Sort by score descending. Score ALL jobs.
 """
-                score_text = call_ai(score_prompt)
+                score_text = call_ai(score_prompt, gemini_api_key)
                 score_result = extract_json(score_text.strip() if score_text else "{}")
                 scores = {s["job_id"]: s["score"] for s in score_result.get("scores", [])}
 
@@ -470,11 +615,11 @@ Sort by score descending. Score ALL jobs.
 
                 # Removed global session list of jobs
 
-        return jsonify({
+        return jsonify(project_fields({
             "success": True,
             "job_count": len(jobs),
             "jobs": jobs
-        })
+        }, "jobs"))
 
     except json.JSONDecodeError as e:
         return jsonify({"success": False, "error": f"Failed to parse AI response as JSON: {str(e)}"}), 500
@@ -489,6 +634,114 @@ Sort by score descending. Score ALL jobs.
     })
 
 
+# ── Draft emails lazily for selected jobs ──
+@app.route('/api/draft-emails', methods=['POST'])
+def draft_emails():
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"success": False, "error": "Request body must be a JSON object."}), 400
+    gemini_api_key = str(data.get("gemini_api_key") or "").strip()
+
+    if not gemini_api_key:
+        return jsonify({"success": False, "error": "No Gemini API key provided. Please enter your API key in Settings."}), 400
+
+    jobs = data.get("jobs", [])
+    if not isinstance(jobs, list) or not jobs:
+        return jsonify({"success": False, "error": "No jobs to draft emails for."}), 400
+    if not all(isinstance(j, dict) for j in jobs):
+        return jsonify({"success": False, "error": "Each job must be an object."}), 400
+    job_ids = [j.get("job_id") for j in jobs]
+    if None in job_ids or len(set(map(str, job_ids))) != len(job_ids):
+        return jsonify({"success": False, "error": "Each job needs a unique job_id."}), 400
+
+    # No disk fallback for the resume: on a shared server the latest upload may
+    # belong to someone else, and drafts are sent out under this user's name
+    sample_email = str(data.get("sample_email") or "")
+    resume_text = str(data.get("resume_text") or "")
+    user_name = str(data.get("user_name") or "")
+
+    user_sample_email_safe = sample_email if sample_email.strip() else "Professional email"
+    user_name_display = user_name if user_name else "[Your Name]"
+
+    # Only ask the model for drafts we haven't produced before
+    drafts = {}
+    pending = []
+    for job in jobs:
+        key = draft_cache_key(job, user_sample_email_safe, resume_text, user_name_display)
+        if key in _draft_cache:
+            drafts[job.get("job_id")] = _draft_cache[key]
+        else:
+            pending.append((key, job))
+
+    if pending:
+        resume_section = f"\nRESUME:\n{resume_text[:2500]}\n" if resume_text else ""
+        DRAFT_PROMPT = f"""
+You are a highly skilled AI assistant specialized in drafting professional job application emails.
+
+For each job below, generate a professional, polite, concise email draft by FOLLOWING the STYLE and STRUCTURE of the template below.
+
+Strict JSON output schema:
+
+{{
+  "drafts": [
+    {{
+      "job_id": number,             # Copied from the input job
+      "email_subject": string,      # Clear, professional subject, e.g., "Application for <Job Title> role"
+      "email_body_draft": string    # Polished email, max 2 short paragraphs + closing
+    }}
+  ]
+}}
+
+Rules for `email_body_draft`:
+- Style reference template (DO NOT COPY TEXT):
+
+\"\"\"
+{user_sample_email_safe}
+\"\"\"
+- Preserve tone and structure
+- Lightly customize for each job using job title, skills, and JD summary
+- Keep paragraphs short and readable
+- Do NOT exaggerate, invent skills, or fabricate experience{" beyond the resume" if resume_text else ""}
+- Ensure proper grammar and professional formatting
+- IMPORTANT: Use explicit `\\n\\n` characters to separate paragraphs.
+- IMPORTANT: End email with "Yours sincerely," followed by the applicant's name: "{user_name_display}"
+
+Additional instructions:
+- Output JSON ONLY
+- Draft exactly one email per job
+{resume_section}
+JOBS:
+{json.dumps([dict({k: job.get(k) for k in DRAFT_JOB_FIELDS}, job_id=job.get("job_id")) for _, job in pending], indent=2)}
+"""
+        try:
+            response_text = call_ai(DRAFT_PROMPT, gemini_api_key)
+            if not response_text:
+                return jsonify({"success": False, "error": "AI model returned an empty response. It may be overloaded. Please try again."}), 500
+
+            parsed_output = extract_json(response_text.strip())
+            generated = {str(d.get("job_id")): d for d in parsed_output.get("drafts", []) if isinstance(d, dict)}
+
+            for key, job in pending:
+                d = generated.get(str(job.get("job_id")))
+                if not d or not d.get("email_body_draft"):
+                    continue
+                draft = {
+                    "email_subject": d.get("email_subject", ""),
+                    "email_body_draft": d.get("email_body_draft", "")
+                }
+                cache_draft(key, draft)
+                drafts[job.get("job_id")] = draft
+
+        except json.JSONDecodeError as e:
+            return jsonify({"success": False, "error": f"Failed to parse AI response as JSON: {str(e)}"}), 500
+        except Exception as e:
+            return jsonify({"success": False, "error": f"Email drafting failed: {str(e)}"}), 500
+
+    return jsonify(project_fields({
+        "success": True,
+        "drafts": [dict(draft, job_id=job_id) for job_id, draft in drafts.items()]
+    }, "drafts"))
+
 # ── Get tracker data ──
 @app.route('/api/tracker', methods=['GET'])
 def get_tracker():
@@ -669,7 +922,7 @@ def admin_list_sheets():
 
 @app.route('/admin')
 def admin_page():
-    return send_from_directory('ui', 'admin.html')
+    return serve_ui_file('admin.html')
 
 
 # =========================
@@ -285,7 +285,7 @@ document.addEventListener('DOMContentLoaded', () => {
             analyzeBtn.disabled = true;
             analyzeBtn.textContent = '⏳ Analyzing with AI...';
             if (analyzeStatus) {
-                analyzeStatus.textContent = 'Sending job text to AI for analysis and email drafting...';
+                analyzeStatus.textContent = 'Sending job text to AI for analysis...';
                 analyzeStatus.style.color = '#818cf8';
             }
 
@@ -294,10 +294,8 @@ document.addEventListener('DOMContentLoaded', () => {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({
-                        sample_email: sampleEmailInput ? sampleEmailInput.value : '',
                         txt_content: localStorage.getItem('txt_content') || '',
                         resume_text: localStorage.getItem('resume_text') || '',
-                        user_name: JSON.parse(localStorage.getItem('rolematch_user') || '{}').name || '',
                         gemini_api_key: localStorage.getItem('gemini_api_key') || ''
                     })
                 });
@@ -319,7 +317,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 renderAll();
 
                 if (analyzeStatus) {
-                    analyzeStatus.textContent = `✅ Found ${data.job_count} eligible jobs! Emails drafted & scored.`;
+                    analyzeStatus.textContent = `✅ Found ${data.job_count} eligible jobs! Scored against your resume.`;
                     analyzeStatus.style.color = '#34d399';
                 }
 
@@ -446,12 +444,14 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
+    function isEligible(j) {
+        const jKey = (j.company || '') + '|' + (j.job_title || '');
+        return j.apply_email && j.apply_email.includes('@') && !sentEmails.has(j.apply_email) && !sentJobKeys.has(jKey);
+    }
+
     function updateStats(filteredJobs) {
         const total = allJobs.length;
-        const eligible = allJobs.filter(j => {
-            const jKey = (j.company || '') + '|' + (j.job_title || '');
-            return j.apply_email && j.apply_email.includes('@') && !sentEmails.has(j.apply_email) && !sentJobKeys.has(jKey);
-        }).length;
+        const eligible = allJobs.filter(isEligible).length;
         const sent = sentJobKeys.size || sentEmails.size; // Prefer count of distinct jobs
 
         animateNumber(statTotal, total);
@@ -496,16 +496,100 @@ document.addEventListener('DOMContentLoaded', () => {
     // EMAIL – REAL SENDING VIA API
     // ──────────────────────────────
 
-    function openModal(job, idx) {
+    // Drafts are generated on demand (not during analysis) and kept on the job,
+    // tagged with the template/resume/name they were written from
+    const DRAFT_BATCH_SIZE = 5;
+    const DRAFT_JOB_FIELDS = ['job_id', 'job_title', 'company', 'apply_email', 'job_type', 'location', 'skills', 'jd_summary'];
+    const pendingDrafts = new Map(); // job_id -> in-flight draft request
+
+    function getDraftContext() {
+        const savedUser = JSON.parse(localStorage.getItem('rolematch_user') || '{}');
+        const context = {
+            sample_email: sampleEmailInput ? sampleEmailInput.value : '',
+            resume_text: localStorage.getItem('resume_text') || '',
+            user_name: savedUser.name || ''
+        };
+        context.key = hashString([context.sample_email, context.resume_text, context.user_name].join('\u0000'));
+        return context;
+    }
+
+    function hasFreshDraft(job, context) {
+        return !!job.email_body_draft && job.draft_key === context.key;
+    }
+
+    async function ensureDraft(job) {
+        const context = getDraftContext();
+        if (hasFreshDraft(job, context)) return { success: true };
+
+        if (!pendingDrafts.has(job.job_id)) {
+            // Batch this job with the next few eligible ones the user is likely to open
+            const batch = [job, ...getFilteredJobs().filter(j =>
+                j !== job && isEligible(j) && !hasFreshDraft(j, context) && !pendingDrafts.has(j.job_id)
+            ).slice(0, DRAFT_BATCH_SIZE - 1)];
+
+            const request = requestDrafts(batch, context);
+            batch.forEach(j => pendingDrafts.set(j.job_id, request));
+            request.then(() => batch.forEach(j => pendingDrafts.delete(j.job_id)));
+        }
+
+        const result = await pendingDrafts.get(job.job_id);
+        if (!result.success) return result;
+        return hasFreshDraft(job, context) ? { success: true } : { success: false, error: 'No draft returned' };
+    }
+
+    async function requestDrafts(batch, context) {
+        try {
+            const res = await fetch(`${API_BASE}/api/draft-emails`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    jobs: batch.map(j => Object.fromEntries(DRAFT_JOB_FIELDS.map(k => [k, j[k]]))),
+                    sample_email: context.sample_email,
+                    resume_text: context.resume_text,
+                    user_name: context.user_name,
+                    gemini_api_key: localStorage.getItem('gemini_api_key') || ''
+                })
+            });
+            const data = await res.json();
+            if (!data.success) return data;
+
+            (data.drafts || []).forEach(draft => {
+                const job = batch.find(j => j.job_id === draft.job_id);
+                if (!job) return;
+                job.email_subject = draft.email_subject;
+                job.email_body_draft = draft.email_body_draft;
+                job.draft_key = context.key;
+            });
+            localStorage.setItem('analyzed_jobs', JSON.stringify(allJobs));
+            return { success: true };
+        } catch (e) {
+            return { success: false, error: 'Cannot connect to server' };
+        }
+    }
+
+    async function openModal(job, idx) {
         currentMailJobIndex = idx;
         modalTitle.textContent = `✉️ Email — ${job.job_title}`;
         modalTo.value = job.apply_email || '';
         const savedUser = JSON.parse(localStorage.getItem('rolematch_user') || '{}');
         const userName = savedUser.name || 'Job Applicant';
 
+        modalSubject.value = '';
+        modalBody.value = '⏳ Drafting email...';
+        modalSendBtn.disabled = true;
+        emailModal.classList.add('open');
+
+        const draft = await ensureDraft(job);
+        if (currentMailJobIndex !== idx) return;
+        if (!draft.success) {
+            // Send stays disabled so the error text can never go out as an email
+            modalBody.value = '❌ ' + (draft.error || 'Drafting failed');
+            return;
+        }
+
         modalSubject.value = (job.email_subject || '').replace(/\[(?:Your|Sender)\s*Name\]/gi, userName);
         modalBody.value = (job.email_body_draft || '').replace(/\[(?:Your|Sender)\s*Name\]/gi, userName);
-        emailModal.classList.add('open');
+        modalSendBtn.disabled = false;
     }
 
     function closeModal() {
@@ -558,6 +642,16 @@ document.addEventListener('DOMContentLoaded', () => {
         btn.classList.add('loading');
         btn.disabled = true;
 
+        const draft = await ensureDraft(job);
+        if (!draft.success) {
+            btn.classList.remove('loading');
+            btn.querySelector('.btn-label').textContent = '❌ Failed';
+            btn.disabled = false;
+            await delay(2000);
+            btn.querySelector('.btn-label').textContent = '📨 Send';
+            return;
+        }
+
         const savedUser = JSON.parse(localStorage.getItem('rolematch_user') || '{}');
         const userName = savedUser.name || 'Job Applicant';
 
@@ -649,6 +743,16 @@ document.addEventListener('DOMContentLoaded', () => {
 
 
 
+    // FNV-1a – a cheap fingerprint, not a security hash
+    function hashString(str) {
+        let h = 0x811c9dc5;
+        for (let i = 0; i < str.length; i++) {
+            h ^= str.charCodeAt(i);
+            h = Math.imul(h, 0x01000193);
+        }
+        return (h >>> 0).toString(16);
+    }
+
     function escHtml(str) {
         if (!str) return '';
         return str.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
@@ -103,7 +103,7 @@ document.addEventListener('DOMContentLoaded', () => {
             const formData = new FormData();
             formData.append('file', file);
 
-            const res = await fetch(`${API_BASE}/api/upload/resume`, {
+            const res = await fetch(`${API_BASE}/api/upload/resume?fields=filename,size,resume_text,resume_name,resume_path`, {
                 method: 'POST',
                 body: formData
             });
@@ -183,7 +183,7 @@ document.addEventListener('DOMContentLoaded', () => {
             const formData = new FormData();
             formData.append('file', file);
 
-            const res = await fetch(`${API_BASE}/api/upload/txt`, {
+            const res = await fetch(`${API_BASE}/api/upload/txt?fields=filename,char_count`, {
                 method: 'POST',
                 body: formData
             });
@@ -203,16 +203,17 @@ document.addEventListener('DOMContentLoaded', () => {
             showStatus(txtStatus, 'success', `Job scrape uploaded! ${data.char_count.toLocaleString()} characters.`);
             
             // Local Storage Saving of Files
-            localStorage.setItem('txt_content', await file.text());
+            const txtContent = await file.text();
+            localStorage.setItem('txt_content', txtContent);
             localStorage.setItem('txt_filename', file.name);
             localStorage.setItem('txt_char_count', data.char_count);
 
             updateChip(txtChip, true, 'Job Scrape');
             updateContinueBtn();
 
-            // Show preview
-            if (data.preview) {
-                txtContentText.textContent = data.preview + (data.char_count > 1000 ? '\n\n... (truncated)' : '');
+            // Show preview (built locally – the server doesn't echo content back)
+            if (txtContent) {
+                txtContentText.textContent = txtContent.slice(0, 1000) + (data.char_count > 1000 ? '\n\n... (truncated)' : '');
                 txtContentPreview.style.display = 'block';
             }
 